@@ -1,19 +1,52 @@
 #!/usr/bin/env python3
 import os
 import sys
+import signal
 import threading
-import json
-from flask import Flask, Response, jsonify
+import gzip
+import zlib
+import base64
+import logging
+from collections import OrderedDict, deque
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from datetime import datetime
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+logger = logging.getLogger(__name__)
+
 # Add server directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'server'))
 
 # Import server modules
 from camera_opencv import Camera
 
+STATUS_HISTORY_LEN = 10  # Number of status updates served by /status
+STREAM_MAX_FPS = 15  # Per-viewer frame rate cap for /video_feed
+SERVER_THREADS = 8  # Request threads for waitress; each MJPEG viewer holds one
+GZIP_MIN_SIZE = 1024  # Only compress /status bodies larger than this
+CAMERA_RETRY_MAX = 30  # Longest wait between camera initialization attempts, in seconds
+
+# 1x1 transparent PNG served as the favicon
+_FAVICON = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAAC0lEQVR4nGNgAAIAAAUAAXpeqz8AAAAASUVORK5CYII=')
+
+def _json(obj):
+    """Build a JSON response, using orjson when it is available."""
+    if orjson is None:
+        return jsonify(obj)
+    return Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+                    mimetype='application/json')
+
 class VideoHost:
     _instance = None
     _lock = threading.Lock()
@@ -34,21 +67,34 @@ class VideoHost:
             self.port = port
             self.debug = debug
             self.camera_lock = threading.Lock()
+            self._latest_frame = None  # Latest JPEG published by the capture thread
+            self._frame_id = 0  # Incremented for every published frame
+            self._frame_cv = threading.Condition()
+            self._stopped = threading.Event()  # Set by cleanup() to end the capture thread
+            self.capture_thread = None
             self.current_status = "Initializing..."
             self.movement_info = None
             self.head_movement_info = None
-            self.status_history = []  # Keep track of status history
+            self.status_history = deque(maxlen=STATUS_HISTORY_LEN)  # Keep track of status history
+            self.detector = None
+            self._status_rev = 0  # Bumped whenever the status fields change
+            self._status_rev_lock = threading.Lock()
+            self._snapshots = OrderedDict()  # Detection snapshots handed out by /status, by id
+            self._snapshots_lock = threading.Lock()
             
             # Register routes
             self.app.route('/')(self.index)
             self.app.route('/video_feed')(self.video_feed)
             self.app.route('/status')(self.get_status)
+            self.app.route('/last_detection.jpg')(self.last_detection_image)
             self.app.route('/favicon.ico')(self.favicon)
             self.initialized = True
     
     def init_camera(self):
         """Initialize camera with lock to prevent conflicts"""
         with self.camera_lock:
+            if self._stopped.is_set():
+                return False  # Do not reopen the camera after cleanup()
             if self.camera is None:
                 try:
                     self.camera = Camera()
@@ -63,25 +109,259 @@ class VideoHost:
                     return False
             return True
         
+    def _current_camera(self):
+        """Return the camera, or None after cleanup().
+
+        Only the lookup is locked; waiting for the next frame outside the lock
+        lets the stream and the detector receive frames concurrently.
+        """
+        with self.camera_lock:
+            return self.camera
+
+    def _capture_frames(self):
+        """Capture thread: publish the latest camera frame to all viewers."""
+        delay = 1
+        while not self.init_camera():
+            print(f"Retrying camera initialization in {delay}s")
+            if self._stopped.wait(delay):
+                return
+            delay = min(delay * 2, CAMERA_RETRY_MAX)
+
+        while not self._stopped.is_set():
+            camera = self._current_camera()
+            if camera is None:
+                break
+            try:
+                frame = camera.get_frame()
+            except Exception as e:
+                print(f"Error getting frame: {e}")
+                time.sleep(0.1)
+                continue
+            if frame is None:
+                print("Warning: Empty frame received")
+                time.sleep(0.1)
+                continue
+            with self._frame_cv:
+                self._latest_frame = frame
+                self._frame_id += 1
+                self._frame_cv.notify_all()
+
+    def _capturing(self):
+        """True while the capture thread can still publish frames."""
+        return self.capture_thread is not None and self.capture_thread.is_alive()
+
     def gen(self):
         """Video streaming generator function."""
-        if not self.init_camera():
-            return
-            
+        frame_interval = 1.0 / STREAM_MAX_FPS
+        last_sent_id = 0
         while True:
-            with self.camera_lock:
-                try:
-                    frame = self.camera.get_frame()
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-                except Exception as e:
-                    print(f"Error getting frame: {e}")
-                    break
+            sent_at = time.monotonic()
+            with self._frame_cv:
+                if not self._frame_cv.wait_for(lambda: self._frame_id != last_sent_id,
+                                               timeout=frame_interval):
+                    if not self._capturing():
+                        return  # End the stream instead of holding a server thread
+                    continue
+                # Always send the newest frame; anything in between is dropped
+                frame = self._latest_frame
+                last_sent_id = self._frame_id
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            time.sleep(max(0, frame_interval - (time.monotonic() - sent_at)))
 
     def index(self):
         """Video streaming home page."""
-        video_feed_url = '/video_feed'  # Direct URL instead of template
-        return """
+        headers = {'ETag': _INDEX_ETAG, 'Cache-Control': 'no-cache'}
+        if request.headers.get('If-None-Match') == _INDEX_ETAG:
+            return Response(status=304, headers=headers)
+        return Response(_INDEX_HTML, mimetype='text/html', headers=headers)
+
+    def video_feed(self):
+        """Video streaming route."""
+        if not self._capturing():
+            return Response('Camera unavailable', status=503, mimetype='text/plain')
+        return Response(self.gen(),
+                       mimetype='multipart/x-mixed-replace; boundary=frame',
+                       headers={'Cache-Control': 'no-store'})
+    
+    def get_raw_frame(self):
+        """Thread-safe method to get the next frame as an array, skipping JPEG."""
+        if not self.init_camera():
+            return None
+
+        camera = self._current_camera()
+        if camera is None:
+            return None
+        try:
+            frame = camera.get_raw_frame()
+            if frame is None:
+                print("Warning: No frame captured from camera")
+            return frame
+        except Exception as e:
+            print(f"Error getting frame: {e}")
+            return None
+    
+    def get_status(self):
+        """Get current process status and detection information."""
+        # Read the snapshot once so its info and image id always match
+        snapshot = self.detector.last_detection if self.detector else None
+        rev = f'{self._status_rev}-{snapshot.id if snapshot else 0}'
+        etag = f'"{rev}"'
+        gzip_etag = f'"{rev}-gz"'  # The compressed body is a separate representation
+        accepts_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match == etag or (accepts_gzip and if_none_match == gzip_etag):
+            return Response(status=304, headers={'ETag': if_none_match,
+                                                 'Vary': 'Accept-Encoding'})
+
+        status_data = {
+            'status': self.current_status,
+            'detection_info': None,
+            'detection_image_id': None,
+            'movement_info': self.movement_info,
+            'head_movement_info': self.head_movement_info,
+            'status_history': [  # Last 10 status updates
+                f"[{time.strftime('%H:%M:%S', time.localtime(t))}] {s}"
+                for t, s in list(self.status_history)
+            ]
+        }
+        
+        if snapshot:
+            status_data['detection_info'] = snapshot.info
+            status_data['detection_image_id'] = snapshot.id
+            self._remember_snapshot(snapshot)
+        
+        response = _json(status_data)
+        response.headers['ETag'] = etag
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['Vary'] = 'Accept-Encoding'
+        if accepts_gzip and response.content_length > GZIP_MIN_SIZE:
+            response.set_data(gzip.compress(response.get_data(), compresslevel=1))
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers['ETag'] = gzip_etag
+        return response
+    
+    def _remember_snapshot(self, snapshot):
+        """Keep the last STATUS_HISTORY_LEN snapshots so history tiles stay loadable."""
+        with self._snapshots_lock:
+            self._snapshots[snapshot.id] = snapshot
+            self._snapshots.move_to_end(snapshot.id)
+            while len(self._snapshots) > STATUS_HISTORY_LEN:
+                self._snapshots.popitem(last=False)
+
+    def last_detection_image(self):
+        """Serve the latest detection snapshot as a raw JPEG."""
+        try:
+            snapshot_id = int(request.args.get('v', ''))
+        except ValueError:
+            return Response(status=404)
+        # Serve exactly the snapshot named by ?v=, never a newer one under its id
+        snapshot = self.detector.last_detection if self.detector else None
+        if snapshot is None or snapshot.id != snapshot_id:
+            with self._snapshots_lock:
+                snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is None:
+            return Response(status=404)
+        headers = {'ETag': f'"{snapshot.id}"',
+                   'Cache-Control': 'public, max-age=31536000, immutable'}
+        if request.headers.get('If-None-Match') == headers['ETag']:
+            return Response(status=304, headers=headers)
+        return Response(snapshot.jpeg, mimetype='image/jpeg', headers=headers)
+
+    def set_detector(self, detector):
+        """Set the motion detector instance for status updates."""
+        self.detector = detector
+        
+    def update_status(self, status):
+        """Update the current process status."""
+        logger.debug("Status Update: %s", status)
+        # Formatted lazily in get_status
+        self.status_history.append((time.time(), status))
+        self.current_status = status
+        with self._status_rev_lock:
+            self._status_rev += 1
+
+    def update_movement_info(self, info):
+        """Update current movement information."""
+        if not isinstance(info, dict):
+            info = {'status': str(info)}
+        
+        # Ensure we have all required fields
+        if 'status' not in info:
+            info['status'] = 'Moving'
+        if 'position' not in info:
+            info['position'] = {'x': 0, 'y': 0, 'angle': 0}
+        if 'progress' not in info:
+            info['progress'] = None
+        if 'details' not in info:
+            info['details'] = None
+            
+        logger.debug("Movement Update: %s", info)
+
+        self.movement_info = info
+        self.update_status(info['status'])
+
+    def update_head_movement(self, info):
+        """Update head movement information."""
+        if not isinstance(info, dict):
+            info = {'status': str(info)}
+            
+        # Ensure we have all required fields
+        if 'x' not in info:
+            info['x'] = 0
+        if 'y' not in info:
+            info['y'] = 0
+        if 'target' not in info:
+            info['target'] = None
+            
+        logger.debug("Head Movement Update: %s", info)
+
+        self.head_movement_info = info
+        self.update_status(info['status'])
+
+    def start(self):
+        """Start the video hosting server in a separate thread."""
+        # Single producer for all /video_feed viewers, running before requests arrive
+        self.capture_thread = threading.Thread(target=self._capture_frames)
+        self.capture_thread.daemon = True
+        self.capture_thread.start()
+
+        def run_server():
+            if serve is not None and not self.debug:
+                serve(self.app, host='0.0.0.0', port=self.port,
+                      threads=SERVER_THREADS, channel_timeout=60)
+                return
+            # Werkzeug dev server for debugging or when waitress is missing
+            self.app.run(
+                host='0.0.0.0',
+                port=self.port,
+                threaded=True,
+                debug=self.debug,
+                use_reloader=False  # Disable reloader in debug mode
+            )
+            
+        self.server_thread = threading.Thread(target=run_server)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        
+        # Initialize status
+        self.update_status("Server started")
+    
+    def cleanup(self):
+        """Clean up camera resources."""
+        self._stopped.set()
+        with self.camera_lock:
+            if self.camera:
+                # Add any necessary camera cleanup here
+                self.camera = None
+
+    def favicon(self):
+        """Return a transparent favicon to prevent 404 errors."""
+        return Response(_FAVICON, mimetype='image/png',
+                        headers={'Cache-Control': 'public, max-age=31536000, immutable'})
+
+# Page served by VideoHost.index, encoded once at import time
+_INDEX_HTML = """
         <html>
             <head>
                 <title>Robot Camera Stream</title>
@@ -298,14 +578,31 @@ class VideoHost:
                     let detectionHistory = [];
                     let robotPosition = { x: 0, y: 0, angle: 0 };
                     let mapScale = 50; // pixels per unit
-                    let pathHistory = [];
+                    const PATH_CAPACITY = 1024; // Maximum number of path points kept for the map
+                    // Ring buffer of path coordinates, one typed array per axis
+                    const pathXs = new Float32Array(PATH_CAPACITY);
+                    const pathYs = new Float32Array(PATH_CAPACITY);
+                    let pathHead = 0; // Index of the oldest point
+                    let pathLen = 0;
                     let lastFrameCenter = null;
                     let lastObjectCenter = null;
                     let overlayTimeout = null;
+                    let statusEtag = null; // ETag of the last /status payload
                     let mapPadding = 50; // padding around the content
                     let initialMapScale = 50; // Initial scale for empty map
                     const MAX_HISTORY = 10; // Maximum number of history items to keep
 
+                    function pushPathPoint(x, y) {
+                        const k = (pathHead + pathLen) % PATH_CAPACITY;
+                        pathXs[k] = x;
+                        pathYs[k] = y;
+                        if (pathLen < PATH_CAPACITY) {
+                            pathLen++;
+                        } else {
+                            pathHead = (pathHead + 1) % PATH_CAPACITY;
+                        }
+                    }
+
                     function updateOverlay(data) {
                         const wrapper = document.querySelector('.video-wrapper');
                         const video = document.querySelector('.video-feed');
@@ -411,9 +708,18 @@ class VideoHost:
                             return;
                         }
                         
-                        // Create history item with timestamp
+                        // Create history item with timestamp; the image is fetched
+                        // once here since the server only keeps the latest one
+                        const img = new Image();
+                        img.src = newDetection.imageUrl;
+                        // Map coordinates are computed once per detection
+                        const distance = newDetection.info.position.distance;
+                        const angle = newDetection.info.position.angle_x * Math.PI / 180;
                         const historyItem = {
                             ...newDetection,
+                            img: img,
+                            cartX: distance * Math.cos(angle),
+                            cartY: distance * Math.sin(angle),
                             timestamp: new Date().toISOString(),
                             overlayData: {
                                 position: newDetection.info.position,
@@ -453,16 +759,19 @@ class VideoHost:
                             const canvas = document.querySelector(`canvas[data-index="${index}"]`);
                             if (canvas) {
                                 const ctx = canvas.getContext('2d');
-                                const img = new Image();
-                                img.onload = () => {
+                                const draw = () => {
                                     // Clear canvas
                                     ctx.clearRect(0, 0, canvas.width, canvas.height);
                                     // Draw image
-                                    ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
+                                    ctx.drawImage(item.img, 0, 0, canvas.width, canvas.height);
                                     // Draw overlay
                                     drawDetectionOverlay(ctx, item.info, canvas.width, canvas.height);
                                 };
-                                img.src = 'data:image/jpeg;base64,' + item.image;
+                                if (item.img.complete && item.img.naturalWidth) {
+                                    draw();
+                                } else {
+                                    item.img.onload = draw;
+                                }
                             }
                         });
                     }
@@ -499,9 +808,16 @@ class VideoHost:
                     }
                     
                     function updateStatus() {
-                        fetch('/status')
-                            .then(response => response.json())
+                        const headers = statusEtag ? { 'If-None-Match': statusEtag } : {};
+                        fetch('/status', { headers, cache: 'no-store' })
+                            .then(response => {
+                                // Nothing changed since the last poll
+                                if (response.status === 304) return null;
+                                statusEtag = response.headers.get('ETag');
+                                return response.json();
+                            })
                             .then(data => {
+                                if (!data) return;
                                 const statusBox = document.getElementById('processStatus');
                                 let statusText = '';
                                 
@@ -528,7 +844,7 @@ class VideoHost:
                                             robotPosition.y !== newPos.y || 
                                             robotPosition.angle !== newPos.angle) {
                                             robotPosition = {...newPos};
-                                            pathHistory.push({...newPos});
+                                            pushPathPoint(newPos.x, newPos.y);
                                             updateMap(data);
                                         }
                                     }
@@ -544,11 +860,11 @@ class VideoHost:
                                 
                                 statusBox.innerText = statusText;
                                 
-                                if (data.detection_info && data.last_detection_image) {
+                                if (data.detection_info && data.detection_image_id) {
                                     updateOverlay(data);
                                     
                                     const detection = {
-                                        image: data.last_detection_image,
+                                        imageUrl: '/last_detection.jpg?v=' + data.detection_image_id,
                                         info: data.detection_info
                                     };
                                     
@@ -589,7 +905,7 @@ class VideoHost:
                         setInterval(updateStatus, 100);
                     }
 
-                    function calculateMapBounds() {
+                    function calculateMapBounds(targetAspect) {
                         // Start with robot's current position
                         let bounds = {
                             minX: robotPosition.x,
@@ -599,25 +915,20 @@ class VideoHost:
                         };
                         
                         // Include path history
-                        pathHistory.forEach(pos => {
-                            bounds.minX = Math.min(bounds.minX, pos.x);
-                            bounds.maxX = Math.max(bounds.maxX, pos.x);
-                            bounds.minY = Math.min(bounds.minY, pos.y);
-                            bounds.maxY = Math.max(bounds.maxY, pos.y);
-                        });
+                        for (let i = 0; i < pathLen; i++) {
+                            const k = (pathHead + i) % PATH_CAPACITY;
+                            bounds.minX = Math.min(bounds.minX, pathXs[k]);
+                            bounds.maxX = Math.max(bounds.maxX, pathXs[k]);
+                            bounds.minY = Math.min(bounds.minY, pathYs[k]);
+                            bounds.maxY = Math.max(bounds.maxY, pathYs[k]);
+                        }
                         
                         // Include detection points
                         detectionHistory.forEach(detection => {
-                            const info = detection.info;
-                            const distance = info.position.distance;
-                            const angle = info.position.angle_x * Math.PI / 180;
-                            const x = distance * Math.cos(angle);
-                            const y = distance * Math.sin(angle);
-                            
-                            bounds.minX = Math.min(bounds.minX, x);
-                            bounds.maxX = Math.max(bounds.maxX, x);
-                            bounds.minY = Math.min(bounds.minY, y);
-                            bounds.maxY = Math.max(bounds.maxY, y);
+                            bounds.minX = Math.min(bounds.minX, detection.cartX);
+                            bounds.maxX = Math.max(bounds.maxX, detection.cartX);
+                            bounds.minY = Math.min(bounds.minY, detection.cartY);
+                            bounds.maxY = Math.max(bounds.maxY, detection.cartY);
                         });
                         
                         // Add padding
@@ -627,24 +938,17 @@ class VideoHost:
                         bounds.minY -= padding;
                         bounds.maxY += padding;
 
-                        // Ensure minimum view size and maintain aspect ratio
-                        const minSize = 2;
-                        const width = Math.max(minSize, bounds.maxX - bounds.minX);
-                        const height = Math.max(minSize, bounds.maxY - bounds.minY);
-                        const aspect = width / height;
-                        
-                        if (aspect > 1) {
-                            // Width is larger, adjust height to match aspect ratio
-                            const newHeight = width / aspect;
-                            const heightDiff = newHeight - height;
-                            bounds.minY -= heightDiff / 2;
-                            bounds.maxY += heightDiff / 2;
+                        // Grow the shorter side so the bounds match the canvas aspect ratio
+                        const boundsWidth = bounds.maxX - bounds.minX;
+                        const boundsHeight = bounds.maxY - bounds.minY;
+                        if (boundsWidth / boundsHeight < targetAspect) {
+                            const pad = (boundsHeight * targetAspect - boundsWidth) / 2;
+                            bounds.minX -= pad;
+                            bounds.maxX += pad;
                         } else {
-                            // Height is larger, adjust width to match aspect ratio
-                            const newWidth = height * aspect;
-                            const widthDiff = newWidth - width;
-                            bounds.minX -= widthDiff / 2;
-                            bounds.maxX += widthDiff / 2;
+                            const pad = (boundsWidth / targetAspect - boundsHeight) / 2;
+                            bounds.minY -= pad;
+                            bounds.maxY += pad;
                         }
                         
                         return bounds;
@@ -667,7 +971,7 @@ class VideoHost:
                         ctx.fillRect(0, 0, width, height);
                         
                         // Calculate bounds and scale
-                        const bounds = calculateMapBounds();
+                        const bounds = calculateMapBounds(width / height);
                         const contentWidth = bounds.maxX - bounds.minX;
                         const contentHeight = bounds.maxY - bounds.minY;
                         
@@ -692,29 +996,31 @@ class VideoHost:
                         ctx.strokeStyle = '#333';
                         ctx.lineWidth = 1;
                         
-                        // Draw grid lines based on scale
+                        // Draw grid lines based on scale, batched into one path
                         const gridSize = 0.5; // 0.5 unit grid
-                        const gridCount = Math.max(width, height) / mapScale;
-                        const startX = -gridCount/2;
-                        const endX = gridCount/2;
-                        const startY = -gridCount/2;
-                        const endY = gridCount/2;
-                        
-                        for(let x = startX; x <= endX; x += gridSize) {
-                            const screenX = transformX(centerOffsetX + x * gridSize);
-                            ctx.beginPath();
+                        const minGridPx = 8; // Coarsen the grid rather than draw denser lines
+                        let gridStep = gridSize;
+                        while (gridStep * mapScale < minGridPx) {
+                            gridStep *= 2;
+                        }
+                        const halfSpanX = width / 2 / mapScale;
+                        const halfSpanY = height / 2 / mapScale;
+                        const endX = centerOffsetX + halfSpanX;
+                        const endY = centerOffsetY + halfSpanY;
+                        
+                        ctx.beginPath();
+                        for (let x = Math.ceil((centerOffsetX - halfSpanX) / gridStep) * gridStep; x <= endX; x += gridStep) {
+                            const screenX = transformX(x);
                             ctx.moveTo(screenX, mapPadding);
                             ctx.lineTo(screenX, height - mapPadding);
-                            ctx.stroke();
                         }
                         
-                        for(let y = startY; y <= endY; y += gridSize) {
-                            const screenY = transformY(centerOffsetY - y * gridSize);
-                            ctx.beginPath();
+                        for (let y = Math.ceil((centerOffsetY - halfSpanY) / gridStep) * gridStep; y <= endY; y += gridStep) {
+                            const screenY = transformY(y);
                             ctx.moveTo(mapPadding, screenY);
                             ctx.lineTo(width - mapPadding, screenY);
-                            ctx.stroke();
                         }
+                        ctx.stroke();
                         
                         // Draw axes
                         ctx.strokeStyle = '#00ff00';
@@ -737,40 +1043,41 @@ class VideoHost:
                         ctx.arc(transformX(centerOffsetX), transformY(centerOffsetY), 5, 0, Math.PI * 2);
                         ctx.stroke();
                         
-                        return { ctx, width, height, centerX, centerY, transformX, transformY };
+                        return { ctx, width, height, centerX, centerY, centerOffsetX, centerOffsetY, transformX, transformY };
                     }
                     
                     function updateMap(data) {
                         const canvas = document.getElementById('mapCanvas');
                         if (!canvas) return;
                         
-                        const { ctx, width, height, centerX, centerY, transformX, transformY } = initMap();
+                        const { ctx, width, height, centerX, centerY, centerOffsetX, centerOffsetY, transformX, transformY } = initMap();
+                        // Transform inlined in the loops below
+                        const s = mapScale, ox = centerOffsetX, oy = centerOffsetY, cx = centerX, cy = centerY;
                         
                         // Draw path history
-                        if (pathHistory.length > 0) {
+                        if (pathLen > 0) {
                             ctx.strokeStyle = '#004400';
                             ctx.lineWidth = 2;
                             ctx.beginPath();
-                            pathHistory.forEach((pos, index) => {
-                                const x = transformX(pos.x);
-                                const y = transformY(pos.y);
-                                if (index === 0) {
+                            for (let i = 0; i < pathLen; i++) {
+                                const k = (pathHead + i) % PATH_CAPACITY;
+                                const x = cx + (pathXs[k] - ox) * s;
+                                const y = cy - (pathYs[k] - oy) * s;
+                                if (i === 0) {
                                     ctx.moveTo(x, y);
                                 } else {
                                     ctx.lineTo(x, y);
                                 }
-                            });
+                            }
                             ctx.stroke();
                         }
                         
                         // Draw detection points
+                        const originX = cx - ox * s;
+                        const originY = cy + oy * s;
                         detectionHistory.forEach(detection => {
-                            const info = detection.info;
-                            const distance = info.position.distance;
-                            const angle = info.position.angle_x * Math.PI / 180;
-                            
-                            const x = transformX(distance * Math.cos(angle));
-                            const y = transformY(distance * Math.sin(angle));
+                            const x = cx + (detection.cartX - ox) * s;
+                            const y = cy - (detection.cartY - oy) * s;
                             
                             // Draw detection point
                             ctx.fillStyle = '#ff0000';
@@ -782,7 +1089,7 @@ class VideoHost:
                             ctx.strokeStyle = '#440000';
                             ctx.setLineDash([5, 5]);
                             ctx.beginPath();
-                            ctx.moveTo(transformX(0), transformY(0));
+                            ctx.moveTo(originX, originY);
                             ctx.lineTo(x, y);
                             ctx.stroke();
                             ctx.setLineDash([]);
@@ -850,152 +1157,19 @@ class VideoHost:
                 </div>
             </body>
         </html>
-        """
-
-    def video_feed(self):
-        """Video streaming route."""
-        def generate():
-            if not self.init_camera():
-                return
-                
-            while True:
-                with self.camera_lock:
-                    try:
-                        frame = self.camera.get_frame()
-                        if frame is not None:
-                            yield (b'--frame\r\n'
-                                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-                        else:
-                            print("Warning: Empty frame received")
-                            time.sleep(0.1)
-                    except Exception as e:
-                        print(f"Error in video feed: {e}")
-                        time.sleep(0.1)
-                        
-        return Response(generate(),
-                       mimetype='multipart/x-mixed-replace; boundary=frame')
-    
-    def get_frame_safe(self):
-        """Thread-safe method to get a frame."""
-        if not self.init_camera():
-            return None
-            
-        with self.camera_lock:
-            try:
-                frame = self.camera.get_frame()
-                if frame is None:
-                    print("Warning: No frame captured from camera")
-                return frame
-            except Exception as e:
-                print(f"Error getting frame: {e}")
-                return None
-    
-    def get_status(self):
-        """Get current process status and detection information."""
-        status_data = {
-            'status': self.current_status,
-            'detection_info': None,
-            'last_detection_image': None,
-            'movement_info': self.movement_info,
-            'head_movement_info': self.head_movement_info,
-            'status_history': self.status_history[-10:]  # Last 10 status updates
-        }
-        
-        if self.detector:
-            if self.detector.detection_info:
-                status_data['detection_info'] = self.detector.detection_info
-                status_data['last_detection_image'] = self.detector.last_detection_image
-        
-        return status_data
-    
-    def set_detector(self, detector):
-        """Set the motion detector instance for status updates."""
-        self.detector = detector
-        
-    def update_status(self, status):
-        """Update the current process status."""
-        if self.debug:
-            print(f"Status Update: {status}")
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.status_history.append(f"[{timestamp}] {status}")
-        self.current_status = status
-
-    def update_movement_info(self, info):
-        """Update current movement information."""
-        if not isinstance(info, dict):
-            info = {'status': str(info)}
-        
-        # Ensure we have all required fields
-        if 'status' not in info:
-            info['status'] = 'Moving'
-        if 'position' not in info:
-            info['position'] = {'x': 0, 'y': 0, 'angle': 0}
-        if 'progress' not in info:
-            info['progress'] = None
-        if 'details' not in info:
-            info['details'] = None
-            
-        if self.debug:
-            print(f"Movement Update: {info}")
-            
-        self.movement_info = info
-        self.update_status(info['status'])
-
-    def update_head_movement(self, info):
-        """Update head movement information."""
-        if not isinstance(info, dict):
-            info = {'status': str(info)}
-            
-        # Ensure we have all required fields
-        if 'x' not in info:
-            info['x'] = 0
-        if 'y' not in info:
-            info['y'] = 0
-        if 'target' not in info:
-            info['target'] = None
-            
-        if self.debug:
-            print(f"Head Movement Update: {info}")
-            
-        self.head_movement_info = info
-        self.update_status(info['status'])
-
-    def start(self):
-        """Start the video hosting server in a separate thread."""
-        def run_server():
-            self.app.run(
-                host='0.0.0.0',
-                port=self.port,
-                threaded=True,
-                debug=self.debug,
-                use_reloader=False  # Disable reloader in debug mode
-            )
-            
-        self.server_thread = threading.Thread(target=run_server)
-        self.server_thread.daemon = True
-        self.server_thread.start()
-        
-        # Initialize status
-        self.current_status = "Server started"
-    
-    def cleanup(self):
-        """Clean up camera resources."""
-        with self.camera_lock:
-            if self.camera:
-                # Add any necessary camera cleanup here
-                self.camera = None
-
-    def favicon(self):
-        """Return a transparent favicon to prevent 404 errors."""
-        return Response(status=204)
+        """.encode('utf-8')
+_INDEX_ETAG = '"%08x"' % zlib.crc32(_INDEX_HTML)
 
 if __name__ == '__main__':
     # Test the video host independently
+    logging.basicConfig(level=logging.DEBUG)
     host = VideoHost()
     host.start()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
     try:
-        while True:
-            pass  # Keep the main thread running
+        stop.wait()  # Sleep until SIGTERM instead of spinning
     except KeyboardInterrupt:
-        print("\nShutting down...")
-        host.cleanup() 
\ No newline at end of file
+        pass
+    print("\nShutting down...")
+    host.cleanup()
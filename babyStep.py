@@ -2,169 +2,484 @@
 import os
 import sys
 import time
+import signal
 import threading
+import queue
 import math
 import datetime
+import logging
 import cv2
 import numpy as np
-import base64  # Add base64 import
+
+try:
+    from turbojpeg import TurboJPEG
+    _turbojpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    # Module or libturbojpeg missing; fall back to cv2.imencode
+    _turbojpeg = None
+
+# Use OpenCV's SIMD code paths and size its thread pool to the Pi's cores
+# (override with the CV_THREADS environment variable)
+cv2.setUseOptimized(True)
+cv2.setNumThreads(int(os.environ.get('CV_THREADS', min(4, os.cpu_count() or 1))))
+# Opt-in OpenCL (T-API) preprocessing, set MOTION_OPENCL=1 where a driver exists
+USE_OPENCL = os.environ.get('MOTION_OPENCL') == '1' and cv2.ocl.haveOpenCL()
+cv2.ocl.setUseOpenCL(USE_OPENCL)
 
 # Add server directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'server'))
 
 # Import server modules
 import move
-import LED
 from babyHost import VideoHost
 from robotLight import RobotLight  # Direct import since server is in Python path
 
-# Global servo lock to prevent competing servo control
-servo_lock = threading.Lock()
+# Global servo lock to prevent competing servo control; reentrant so the
+# safe_* helpers can be called from code already holding it
+servo_lock = threading.RLock()
+
+# The four phases that make up one full gait step
+GAIT_PHASES = (1, 2, 3, 4)
+
+# Motion detection runs on frames downscaled to this width
+MOTION_WIDTH = 320
+# Box blur kernel for the downscaled frame (21x21 at 640px is ~11x11 at 320px);
+# the kernel shape does not matter for motion masks, and a box filter is a
+# running sum instead of 11 multiply-adds per pixel and pass
+BLUR_KSIZE = (11, 11)
+# Half of the camera's field of view (assuming 60° FOV), in degrees
+HALF_FOV_DEG = 30
+# Idle backoff between frames when the mask is completely empty; capped near
+# a few frame periods so a quiet scene is still sampled several times a second
+IDLE_BACKOFF_START = 0.05
+IDLE_BACKOFF_MAX = 0.2
+# Process every Nth camera frame while nothing is being tracked
+IDLE_FRAME_SKIP = 3
+# JPEG settings for detection snapshots, sized for the 320x240 history canvases
+DETECTION_JPEG_QUALITY = 60
+DETECTION_JPEG_PARAMS = [int(cv2.IMWRITE_JPEG_QUALITY), DETECTION_JPEG_QUALITY]
+DETECTION_THUMB_WIDTH = 320
+# Minimum contour area for a detection, in full-resolution pixels
+MIN_CONTOUR_AREA = 1500
+
+def compute_position(center_x, center_y, w, h, frame_center_x, frame_center_y,
+                     deg_per_px_x, deg_per_px_y):
+    """Return (angle_x, angle_y, distance) of an object's bounding box relative to the robot."""
+    # Calculate angles from the precomputed degrees-per-pixel scaling
+    angle_x = (center_x - frame_center_x) * deg_per_px_x
+    angle_y = (center_y - frame_center_y) * deg_per_px_y
+    
+    # Get current head position
+    head_x = 300  # Default center position
+    head_y = 300  # Default center position
+    
+    # Calculate total angles including head position
+    total_angle_x = angle_x + (head_x - 300) / 10
+    total_angle_y = angle_y + (head_y - 300) / 10
+    
+    # Estimate distance based on object size
+    distance = 1000 / math.sqrt(w * h)
+    return total_angle_x, total_angle_y, distance
+
+class DetectionSnapshot:
+    """An annotated frame and its info, published together as one reference."""
+    __slots__ = ('id', 'frame', 'info', '_jpeg')
+
+    def __init__(self, id, frame, info):
+        self.id = id  # Unique per published snapshot; pairs info with its image
+        self.frame = frame
+        self.info = info
+        self._jpeg = None
+
+    @property
+    def jpeg(self):
+        """JPEG thumbnail of the frame, encoded on first access."""
+        if self._jpeg is None:
+            frame = self.frame
+            height, width = frame.shape[:2]
+            if width > DETECTION_THUMB_WIDTH:
+                thumb_size = (DETECTION_THUMB_WIDTH, round(height * DETECTION_THUMB_WIDTH / width))
+                frame = cv2.resize(frame, thumb_size, interpolation=cv2.INTER_AREA)
+            if _turbojpeg is not None:
+                self._jpeg = _turbojpeg.encode(frame, quality=DETECTION_JPEG_QUALITY)
+            else:
+                _, buffer = cv2.imencode('.jpg', frame, DETECTION_JPEG_PARAMS)
+                self._jpeg = buffer.tobytes()
+        return self._jpeg
 
 class MotionDetector:
-    def __init__(self, camera):
+    def __init__(self, camera, bg_model='average'):
         self.camera = camera
+        self.bg_model = bg_model  # 'average' (running average) or 'mog2'
+        self.mog2 = None
         self.avg = None
         self.last_motion = None
         self.motion_detected = False
         self.object_position = None
-        self.last_detection_image = None
-        self.detection_info = None
+        self.last_detection = None  # DetectionSnapshot, replaced as a whole
+        self._detection_count = 0  # Id of the last published DetectionSnapshot
         self.is_moving = False
         self.scan_count = 0  # Add counter for background reset
+        self.bg_update_every = 3  # Update the background model every Nth frame
+        self.avg_u8 = None  # uint8 copy of self.avg, refreshed when avg changes
+        self.frame_delta = None
+        self.thresh = None
+        self._gray = None  # Full-resolution grayscale buffer
+        self._small = None  # Downscaled buffer, None when no downscale is needed
+        self._scale = 1.0  # Downscaled width / full width
+        self._labels = None  # connectedComponentsWithStats label buffer
+        self.frame_center_x = None  # Set with the buffers for the current frame size
+        self.frame_center_y = None
+        self._deg_per_px_x = None
+        self._deg_per_px_y = None
+        # One 5x5 pass equals two 3x3 iterations for a rectangular kernel
+        self.dilate_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        self._lock = threading.Lock()
+        self._latest_position = None  # Latched by the worker, consumed by detect_motion
+        self._reset_pending = False
+        self.result_event = threading.Event()  # Set when a new position is latched
+        self._thread = None
+        self._stop = threading.Event()  # Set by stop() to end the worker
+        self._frame_counter = 0
+        self._skip = IDLE_FRAME_SKIP  # 1 while tracking a detection
+        self._reset_model()
+        
+    def _reset_model(self):
+        """Drop the background model; it is rebuilt from the next frames."""
+        self.avg = None
+        self.scan_count = 0
+        if self.bg_model == 'mog2':
+            self.mog2 = cv2.createBackgroundSubtractorMOG2(
+                history=200, varThreshold=25, detectShadows=False)
+        
+    def start(self):
+        """Start the background detection worker."""
+        self._thread = threading.Thread(target=self._detect_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Ask the background detection worker to exit."""
+        self._stop.set()
         
     def reset_detection(self):
         """Reset the background model to start fresh detection."""
-        self.avg = None
+        with self._lock:
+            # The worker owns the model; it resets it before the next frame
+            self._reset_pending = True
+            self._latest_position = None
+            self.result_event.clear()
         self.last_motion = None
         self.motion_detected = False
-        self.scan_count = 0
+        
+    def _detect_loop(self):
+        """Worker thread: run the detection pipeline on every camera frame."""
+        idle_delay = 0
+        while not self._stop.is_set():
+            try:
+                if self._reset_pending:
+                    self._reset_pending = False
+                    self._reset_model()
+                    idle_delay = 0
+                if self.is_moving:
+                    self._stop.wait(0.05)
+                    continue
+                self._frame_counter += 1
+                if self._frame_counter % self._skip:
+                    self.camera.get_raw_frame()  # Drain the frame without processing it
+                    continue
+                last_motion = self.last_motion
+                position = self._process_frame()
+                # Track every frame while there is a target, thin out otherwise
+                self._skip = 1 if position else IDLE_FRAME_SKIP
+                if position or self.last_motion is not last_motion:
+                    idle_delay = 0  # Any changed pixel ends the backoff at once
+                else:
+                    idle_delay = min(max(idle_delay * 1.5, IDLE_BACKOFF_START), IDLE_BACKOFF_MAX)
+                    self._stop.wait(idle_delay)
+                if position:
+                    with self._lock:
+                        # Drop results from a frame that straddled a reset
+                        if not self._reset_pending:
+                            self._latest_position = position
+                            self.result_event.set()
+            except Exception as e:
+                # Keep detecting after a bad frame, e.g. across a camera restart
+                print(f"Error in motion detector: {e}")
+                self._stop.wait(0.5)
         
     def detect_motion(self):
-        """Detect motion and calculate object position relative to robot."""
+        """Return the latest detected object position once, or None."""
         if self.is_moving:
             return None
-            
-        frame = self.camera.get_frame_safe()
-        if frame is None:
-            return None
-            
-        # Convert bytes to numpy array
-        nparr = np.frombuffer(frame, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if img is None:
-            print("Failed to decode image")
-            return None
-            
-        # Make a copy for drawing
-        display_img = img.copy()
-            
-        # Convert to grayscale and blur
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        with self._lock:
+            position = self._latest_position
+            self._latest_position = None
+            self.result_event.clear()
+        return position
+        
+    def _ensure_buffers(self, shape):
+        """(Re)allocate the grayscale buffers when the frame size changes."""
+        if self._gray is not None and self._gray.shape == shape:
+            return
+        height, width = shape
+        self._gray = np.empty(shape, np.uint8)
+        self.frame_center_x = width // 2
+        self.frame_center_y = height // 2
+        self._deg_per_px_x = HALF_FOV_DEG / self.frame_center_x
+        self._deg_per_px_y = HALF_FOV_DEG / self.frame_center_y
+        if width > MOTION_WIDTH:
+            small_height = round(height * MOTION_WIDTH / width)
+            self._small = np.empty((small_height, MOTION_WIDTH), np.uint8)
+            self._scale = MOTION_WIDTH / width
+        else:
+            self._small = None
+            self._scale = 1.0
+        # Label image for the blob search, at the motion frame size
+        mask_shape = self._small.shape if self._small is not None else shape
+        self._labels = np.empty(mask_shape, np.int32)
+
+    def _init_background(self, gray):
+        """Start a new background model from the given frame."""
+        # Background is kept as uint16 fixed point (8 fractional bits)
+        self.avg = gray.astype(np.uint16) << 8
+        self.avg_u8 = gray.copy()
+        if self.frame_delta is None or self.frame_delta.shape != gray.shape:
+            self.frame_delta = np.empty_like(gray)
+            self.thresh = np.empty_like(gray)
+
+    def _foreground_mask(self, gray):
+        """Return the dilated motion mask for a blurred frame, or None while the model settles."""
+        if self.mog2 is not None:
+            thresh = self.mog2.apply(gray)
+            cv2.dilate(thresh, self.dilate_kernel, dst=thresh)
+            return thresh
 
         # Initialize background model if needed
         if self.avg is None:
-            self.avg = gray.copy().astype("float")
+            self._init_background(gray)
             time.sleep(0.1)  # Reduced initialization delay
             return None
 
         # Reset background model periodically to handle changes
         self.scan_count += 1
         if self.scan_count > 100:  # Reset after 100 scans
-            self.avg = gray.copy().astype("float")
+            self._init_background(gray)
             self.scan_count = 0
             return None
 
-        # Accumulate weighted average with faster adaptation
-        cv2.accumulateWeighted(gray, self.avg, 0.2)  # Faster background update
-        frameDelta = cv2.absdiff(gray, cv2.convertScaleAbs(self.avg))
+        # Accumulate weighted average with faster adaptation; the difference
+        # below still runs on every frame
+        if self.scan_count % self.bg_update_every == 0:
+            # avg = 0.8 * avg + 0.2 * gray, in one pass over the fixed-point model
+            cv2.addWeighted(self.avg, 0.8, gray, 0.2 * 256, 0,
+                            dst=self.avg, dtype=cv2.CV_16U)  # Faster background update
+            cv2.convertScaleAbs(self.avg, dst=self.avg_u8, alpha=1 / 256)
+        cv2.absdiff(gray, self.avg_u8, dst=self.frame_delta)
 
-        # Threshold and dilate
-        thresh = cv2.threshold(frameDelta, 3, 255, cv2.THRESH_BINARY)[1]
-        thresh = cv2.dilate(thresh, None, iterations=2)
+        # Threshold and dilate into the preallocated mask
+        thresh = self.thresh
+        cv2.threshold(self.frame_delta, 3, 255, cv2.THRESH_BINARY, dst=thresh)
+        cv2.dilate(thresh, self.dilate_kernel, dst=thresh)
+        return thresh
 
-        # Find contours
-        contours = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]
+    def _process_frame(self):
+        """Detect motion and calculate object position relative to robot."""
+        # Raw frame from the camera thread; only the web stream needs the JPEG
+        img = self.camera.get_raw_frame()
+        if img is None:
+            time.sleep(0.1)  # Avoid spinning while the camera is unavailable
+            return None
+            
+        # Convert to grayscale, downscale and blur, reusing buffers across frames
+        self._ensure_buffers(img.shape[:2])
+        if USE_OPENCL:
+            # Keep the preprocessing chain on the device, download once for the model
+            gray = cv2.cvtColor(cv2.UMat(img), cv2.COLOR_BGR2GRAY)
+            if self._small is not None:
+                gray = cv2.resize(gray, self._small.shape[::-1],
+                                  interpolation=cv2.INTER_AREA)
+            gray = cv2.blur(gray, BLUR_KSIZE).get()
+        else:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=self._gray)
+            if self._small is not None:
+                gray = cv2.resize(gray, self._small.shape[::-1], dst=self._small,
+                                  interpolation=cv2.INTER_AREA)
+            cv2.blur(gray, BLUR_KSIZE, dst=gray)
+        scale = self._scale
 
-        # Process largest contour
-        if len(contours) > 0:
-            largest_contour = max(contours, key=cv2.contourArea)
-            if cv2.contourArea(largest_contour) > 1500:  # Reduced area threshold
-                (x, y, w, h) = cv2.boundingRect(largest_contour)
-                center_x = x + w//2
-                center_y = y + h//2
-                
-                # Draw rectangle and center point on the display image
-                cv2.rectangle(display_img, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                cv2.circle(display_img, (center_x, center_y), 5, (0, 0, 255), -1)
-                
-                # Calculate relative position from center of frame
-                frame_center_x = display_img.shape[1] // 2
-                frame_center_y = display_img.shape[0] // 2
-                
-                # Draw vector from center to object
-                cv2.line(display_img, 
-                        (frame_center_x, frame_center_y),
-                        (center_x, center_y),
-                        (0, 255, 0), 2)
-                
-                # Calculate angles (assuming 60° FOV for the camera)
-                angle_x = ((center_x - frame_center_x) / frame_center_x) * 30
-                angle_y = ((center_y - frame_center_y) / frame_center_y) * 30
-                
-                # Get current head position
-                head_x = 300  # Default center position
-                head_y = 300  # Default center position
-                
-                # Calculate total angles including head position
-                total_angle_x = angle_x + (head_x - 300) / 10
-                total_angle_y = angle_y + (head_y - 300) / 10
-                
-                # Estimate distance based on object size
-                distance = 1000 / math.sqrt(w * h)
-                
-                self.object_position = {
-                    'angle_x': total_angle_x,
-                    'angle_y': total_angle_y,
-                    'distance': distance
-                }
-                
-                # Save detection information with base64 encoded image
-                _, buffer = cv2.imencode('.jpg', display_img)
-                self.last_detection_image = base64.b64encode(buffer).decode('utf-8')
-                self.detection_info = {
-                    'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'position': self.object_position,
-                    'object_size': {'width': w, 'height': h},
-                    'center': {'x': center_x, 'y': center_y},
-                    'frame_center': {'x': frame_center_x, 'y': frame_center_y}
-                }
-                
-                self.motion_detected = True
-                return self.object_position
+        thresh = self._foreground_mask(gray)
+        if thresh is None:
+            return None
+
+        # Skip the blob search when too few pixels changed to pass the area gate
+        min_area = MIN_CONTOUR_AREA * scale * scale
+        changed = cv2.countNonZero(thresh)
+        if changed:
+            self.last_motion = time.monotonic()
+        if changed < min_area:
+            return None
+
+        # Label connected blobs; the stats give each blob's box and pixel area
+        # in one pass, without building per-contour point lists
+        num_labels, _, stats, _ = cv2.connectedComponentsWithStats(
+            thresh, labels=self._labels, connectivity=8)
+        best = None
+        if num_labels > 1:
+            largest = 1 + int(stats[1:, cv2.CC_STAT_AREA].argmax())  # Label 0 is the background
+            if stats[largest, cv2.CC_STAT_AREA] > min_area:
+                best = stats[largest, :4]
+
+        # Process largest blob
+        if best is not None:
+            (x, y, w, h) = best
+            # Map the bounding box back to full resolution
+            x, y, w, h = int(x / scale), int(y / scale), int(w / scale), int(h / scale)
+            center_x = x + w//2
+            center_y = y + h//2
+            
+            # Copy for drawing only once there is something to draw; the
+            # copy is kept as the detection snapshot, so it is not pooled
+            display_img = img.copy()
+            
+            # Draw rectangle and center point on the display image
+            cv2.rectangle(display_img, (x, y), (x + w, y + h), (0, 255, 0), 2)
+            cv2.circle(display_img, (center_x, center_y), 5, (0, 0, 255), -1)
+            
+            # Relative position from center of frame, cached per frame size
+            frame_center_x = self.frame_center_x
+            frame_center_y = self.frame_center_y
+            
+            # Draw vector from center to object
+            cv2.line(display_img, 
+                    (frame_center_x, frame_center_y),
+                    (center_x, center_y),
+                    (0, 255, 0), 2)
+            
+            total_angle_x, total_angle_y, distance = compute_position(
+                center_x, center_y, w, h, frame_center_x, frame_center_y,
+                self._deg_per_px_x, self._deg_per_px_y)
+            
+            self.object_position = {
+                'angle_x': total_angle_x,
+                'angle_y': total_angle_y,
+                'distance': distance
+            }
+            
+            # Publish image and info with a single reference swap; the image
+            # is JPEG encoded on demand
+            self._detection_count += 1
+            self.last_detection = DetectionSnapshot(self._detection_count, display_img, {
+                'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'position': self.object_position,
+                'object_size': {'width': w, 'height': h},
+                'center': {'x': center_x, 'y': center_y},
+                'frame_center': {'x': frame_center_x, 'y': frame_center_y}
+            })
+            
+            self.motion_detected = True
+            return self.object_position
                 
         return None
 
-def safe_move(step, speed, direction):
-    """Thread-safe wrapper for move commands."""
+def _sleep_until(deadline):
+    """Sleep until a time.monotonic() deadline and return the time the next one should follow."""
+    now = time.monotonic()
+    if deadline > now:
+        time.sleep(deadline - now)
+        return deadline
+    return now  # Overran: restart the cadence from now instead of bursting to catch up
+
+def safe_move_sequence(steps, speed, direction, interval, next_tick=None):
+    """Thread-safe wrapper running several move commands under one lock acquisition.
+    
+    Each command is followed by a wait until `interval` seconds after the
+    previous deadline; returns the last deadline so callers can keep the cadence.
+    """
+    if next_tick is None:
+        next_tick = time.monotonic()
     with servo_lock:
-        move.move(step, speed, direction)
-        time.sleep(0.05)  # Add small delay between servo movements
+        for step in steps:
+            move.move(step, speed, direction)
+            next_tick = _sleep_until(next_tick + interval)
+    return next_tick
+
+class MovementWorker:
+    """Single long-running thread that executes queued gait commands.
+    
+    Commands are ('move', steps, speed, direction, interval) and ('stand',).
+    If no command follows a move within `watchdog` seconds the robot is
+    stood up, so a stalled caller never leaves the legs mid-gait.
+    """
+    def __init__(self, watchdog=0.25, step_gap=0.05):
+        self.command_queue = queue.Queue()
+        self.watchdog = watchdog
+        self.step_gap = step_gap  # Pause after each queued gait step
+        self._thread = None
+        
+    def start(self):
+        """Start the worker thread."""
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        
+    def put(self, command):
+        """Queue a command for the worker."""
+        self.command_queue.put(command)
+        
+    def wait(self):
+        """Block until every queued command has been executed."""
+        self.command_queue.join()
+        
+    def _stand(self):
+        with servo_lock:
+            move.stand()
+        
+    def _run(self):
+        next_tick = None  # Gait cadence, None while standing
+        while True:
+            try:
+                command = self.command_queue.get(
+                    timeout=self.watchdog if next_tick is not None else None)
+            except queue.Empty:
+                # Watchdog: no follow-up step arrived, stop walking
+                self._stand()
+                next_tick = None
+                continue
+            try:
+                if command[0] == 'move':
+                    _, steps, speed, direction, interval = command
+                    next_tick = safe_move_sequence(steps, speed, direction, interval, next_tick)
+                    next_tick = _sleep_until(next_tick + self.step_gap)
+                elif command[0] == 'stand':
+                    self._stand()
+                    next_tick = None
+            except Exception as e:
+                print(f"Error in movement worker: {e}")
+                next_tick = None
+            finally:
+                self.command_queue.task_done()
+
+# Head movement commands by direction
+_LOOK_DISPATCH = {
+    'up': move.look_up,
+    'down': move.look_down,
+    'left': move.look_left,
+    'right': move.look_right,
+    'home': move.look_home,
+}
 
 def safe_look(direction, steps=None):
     """Thread-safe wrapper for look commands with step control."""
+    look = _LOOK_DISPATCH.get(direction)
+    if look is None:
+        return
     with servo_lock:
-        if direction == 'up':
-            move.look_up(steps)
-        elif direction == 'down':
-            move.look_down(steps)
-        elif direction == 'left':
-            move.look_left(steps)
-        elif direction == 'right':
-            move.look_right(steps)
-        elif direction == 'home':
-            move.look_home()
+        # Without steps, use move's default head wiggle
+        if steps is None:
+            look()
+        else:
+            look(steps)
         time.sleep(0.1)  # Add delay after head movement
 
 def perform_movement_sequence():
@@ -174,27 +489,11 @@ def perform_movement_sequence():
         move.init_all()
     time.sleep(1)
     
-    # Move forward 2 steps
-    for _ in range(2):
-        safe_move(1, 35, 'no')
-        time.sleep(0.1)
-        safe_move(2, 35, 'no')
-        time.sleep(0.1)
-        safe_move(3, 35, 'no')
-        time.sleep(0.1)
-        safe_move(4, 35, 'no')
-        time.sleep(0.1)
-    
-    # Turn left 2 steps
-    for _ in range(2):
-        safe_move(1, 35, 'left')
-        time.sleep(0.1)
-        safe_move(2, 35, 'left')
-        time.sleep(0.1)
-        safe_move(3, 35, 'left')
-        time.sleep(0.1)
-        safe_move(4, 35, 'left')
-        time.sleep(0.1)
+    # Move forward 2 steps, then turn left 2 steps, one gait phase every 0.15s
+    next_tick = None
+    for direction in ('no', 'left'):
+        for _ in range(2):
+            next_tick = safe_move_sequence(GAIT_PHASES, 35, direction, 0.15, next_tick)
     
     # Move head
     safe_look('up')
@@ -266,19 +565,9 @@ def move_to_object(position):
         host.update_movement_info(movement_info)
         
         for step in range(steps):
-            with servo_lock:
-                # Execute full step sequence atomically with reduced delays
-                move.move(1, 35, direction)
-                time.sleep(0.02)
-                move.move(2, 35, direction)
-                time.sleep(0.02)
-                move.move(3, 35, direction)
-                time.sleep(0.02)
-                move.move(4, 35, direction)
-                time.sleep(0.02)
-            
-            # Reduced delay between steps
-            time.sleep(0.05)
+            # Execute full step sequence on the movement worker
+            mover.put(('move', GAIT_PHASES, 35, direction, 0.02))
+            mover.wait()
             
             # Update position and progress
             current_position['angle'] += (turn_angle/steps) * (1 if direction == 'left' else -1)
@@ -287,53 +576,46 @@ def move_to_object(position):
             host.update_movement_info(movement_info)
     
     # Move forward
-    start_time = time.time()
+    start_time = time.monotonic()
     step_count = 0
     
     movement_info['status'] = f"Moving forward for {movement_plan['forward']['duration']} seconds"
     host.update_movement_info(movement_info)
     
-    while time.time() - start_time < 2:
-        with servo_lock:
-            # Execute full step sequence atomically with reduced delays
-            move.move(1, 35, 'no')
-            time.sleep(0.02)
-            move.move(2, 35, 'no')
-            time.sleep(0.02)
-            move.move(3, 35, 'no')
-            time.sleep(0.02)
-            move.move(4, 35, 'no')
-            time.sleep(0.02)
-        
-        # Reduced delay between steps
-        time.sleep(0.05)
+    # Heading is fixed while walking forward, so convert the step to x/y once
+    angle_rad = math.radians(current_position['angle'])
+    step_distance = distance / 5  # Divide total distance into 5 steps
+    step_dx = step_distance * math.cos(angle_rad)
+    step_dy = step_distance * math.sin(angle_rad)
+    
+    while time.monotonic() - start_time < 2:
+        # Execute full step sequence on the movement worker
+        mover.put(('move', GAIT_PHASES, 35, 'no', 0.02))
+        mover.wait()
         
         step_count += 1
-        progress = min((time.time() - start_time) / 2.0 * 100, 100)
+        progress = min((time.monotonic() - start_time) / 2.0 * 100, 100)
         
         # Update position based on movement
-        angle_rad = math.radians(current_position['angle'])
-        step_distance = distance / 5  # Divide total distance into 5 steps
-        current_position['x'] += step_distance * math.cos(angle_rad)
-        current_position['y'] += step_distance * math.sin(angle_rad)
+        current_position['x'] += step_dx
+        current_position['y'] += step_dy
         
         movement_info['position'] = current_position
         movement_info['status'] = f"Forward progress: {progress:.0f}% ({step_count} steps)"
         host.update_movement_info(movement_info)
     
     # Stop and stand
-    with servo_lock:
-        move.stand()
-        movement_info['status'] = "Movement complete. Standing by."
-        movement_info['position'] = current_position
-        host.update_movement_info(movement_info)
+    mover.put(('stand',))
+    mover.wait()
+    movement_info['status'] = "Movement complete. Standing by."
+    movement_info['position'] = current_position
+    host.update_movement_info(movement_info)
     
     # Reset moving flag
     detector.is_moving = False
     
     # Clear detection history after movement
-    detector.last_detection_image = None
-    detector.detection_info = None
+    detector.last_detection = None
 
 def sequence_with_status():
     try:
@@ -398,15 +680,15 @@ def sequence_with_status():
             time.sleep(0.1)
             
             position = None
-            scan_start_time = time.time()
+            scan_start_time = time.monotonic()
             
             while not position and not detector.is_moving:
                 position = detector.detect_motion()
                 
                 # Update status periodically
-                if time.time() - scan_start_time > 1.0:
+                if time.monotonic() - scan_start_time > 1.0:
                     host.update_status("Scanning for movement...")
-                    scan_start_time = time.time()
+                    scan_start_time = time.monotonic()
                 
                 if position:
                     host.update_status("Motion detected! Moving to target...")
@@ -429,10 +711,8 @@ def sequence_with_status():
                     time.sleep(0.1)  # Brief pause before next scan
                     break
                 
-                time.sleep(0.01)  # Minimal delay between scans
-            
-            # Ensure LED is off between detection cycles
-            RL.both_off()
+                # Block until the worker latches a detection or the next status update is due
+                detector.result_event.wait(timeout=max(0, 1.0 - (time.monotonic() - scan_start_time)))
             
     except Exception as e:
         error_msg = f"Error in main sequence: {e}"
@@ -448,7 +728,10 @@ def sequence_with_status():
 if __name__ == '__main__':
     try:
         # Start video host (singleton ensures only one instance)
-        host = VideoHost(port=5000, debug=True)
+        # Flask debug server and DEBUG logging only when VIDEO_DEBUG=1
+        debug = os.environ.get('VIDEO_DEBUG') == '1'
+        logging.basicConfig(level=logging.DEBUG if debug else logging.WARNING)
+        host = VideoHost(port=5000, debug=debug)
         
         # Initialize LED control first
         RL = RobotLight()
@@ -467,6 +750,11 @@ if __name__ == '__main__':
         # Initialize motion detector with the camera instance
         host.update_status("Initializing motion detector...")
         detector = MotionDetector(host)
+        detector.start()
+        
+        # Single worker that executes all gait commands
+        mover = MovementWorker()
+        mover.start()
         
         # Set detector in video host for status updates
         host.set_detector(detector)
@@ -487,13 +775,16 @@ if __name__ == '__main__':
         RL.green()
         host.update_status("System ready - Motion detection active")
         
-        # Keep the main thread running
-        while True:
-            time.sleep(1)
+        # Block the main thread until Ctrl-C or SIGTERM; both raise
+        # KeyboardInterrupt and run the shutdown below
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        threading.Event().wait()
             
     except KeyboardInterrupt:
         print("\nShutting down...")
         host.update_status("Shutting down...")
+        if 'detector' in locals():
+            detector.stop()
         with servo_lock:
             move.clean_all()
         RL.both_off()
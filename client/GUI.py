@@ -8,15 +8,17 @@
 # Date		: 2023/06/14
 
 from socket import *
+import os
 import sys
 import time
 import threading as thread
+import queue
+import selectors
 import tkinter as tk
 
 try:#1
 	import cv2
 	import zmq
-	import base64
 	import numpy as np
 except:
 	print("Couldn't import OpenCV, you need to install it first.")
@@ -43,64 +45,112 @@ SmoothMode = 0
 ########>>>>>VIDEO<<<<<########
 
 def video_thread():
-	global footage_socket, font, frame_num, fps
+	global footage_socket, font
 	context = zmq.Context()
 	footage_socket = context.socket(zmq.SUB)
+	footage_socket.setsockopt(zmq.CONFLATE, 1)	#Keep only the newest frame; must be set before connect
 	footage_socket.connect('tcp://%s:5555'%ip_adr)
-	footage_socket.setsockopt_string(zmq.SUBSCRIBE, np.unicode(''))
+	footage_socket.setsockopt(zmq.SUBSCRIBE, b'')
 
 	font = cv2.FONT_HERSHEY_SIMPLEX
 	
 
-	frame_num = 0
-	fps = 0
 
-def get_FPS():
-	global frame_num, fps
-	while 1:
-		try:
-			time.sleep(1)
-			fps = frame_num
-			frame_num = 0
-		except:
-			time.sleep(1)
+frame_total = 0		#Frames shown since start; written only by opencv_r
+fps = 0
 
-def opencv_r():
-	global frame_num
+def get_FPS(last=0):		#Runs every second on the Tk loop; reads the running total so it never races opencv_r
+	global fps
+	total = frame_total
+	fps = total - last
+	root.after(1000, get_FPS, total)
+
+def decode_r(frames):			#Receive and decode frames ahead of the display loop
+	backoff = 0.05
 	while True:
 		try:
-			# try:
-			frame = footage_socket.recv_string()
-			# except Exception as e:
-			# 	print(e)
-
-			img = base64.b64decode(frame)
-			npimg = np.frombuffer(img, dtype=np.uint8)
+			frame = footage_socket.recv(copy=False)	#zmq.Frame holding the raw JPEG,read in place without a copy
+			npimg = np.frombuffer(frame.buffer, dtype=np.uint8)
 			source = cv2.imdecode(npimg, 1)
-			cv2.putText(source,('PC FPS: %s'%fps),(40,20), font, 0.5,(255,255,255),1,cv2.LINE_AA)
+		except zmq.ContextTerminated:
+			frames.put(None)				#Tell opencv_r the stream has ended
+			break
+		except cv2.error:					#One corrupt frame,wait for the next
+			continue
+		except Exception as e:				#Socket not set up yet or a transient error,retry with backoff
+			print('Video receive failed: %s'%e)
+			time.sleep(backoff)
+			backoff = min(backoff * 2, 1.0)
+			continue
+		backoff = 0.05
+		if source is None:					#imdecode returns None for data it cannot decode
+			continue
+		if frames.full():					#Display is behind: replace the undisplayed frame
 			try:
-				cv2.putText(source,('CPU Temperature: %s'%CPU_TEP),(370,350), font, 0.5,(128,255,128),1,cv2.LINE_AA)
-				cv2.putText(source,('CPU Usage: %s'%CPU_USE),(370,380), font, 0.5,(128,255,128),1,cv2.LINE_AA)
-				cv2.putText(source,('RAM Usage: %s'%RAM_USE),(370,410), font, 0.5,(128,255,128),1,cv2.LINE_AA)
+				frames.get_nowait()
+			except queue.Empty:
+				pass
+		frames.put(source)
 
-				#cv2.line(source,(320,240),(260,300),(255,255,255),1)
-				#cv2.line(source,(210,300),(260,300),(255,255,255),1)
+overlay_key = None		#Text lines the cached overlay sprites were rendered from
+overlay_sprites = []	#(y0, y1, x0, x1, pixels, inv_alpha) for each text line
 
-				#cv2.putText(source,('%sm'%ultra_data),(210,290), font, 0.5,(255,255,255),1,cv2.LINE_AA)
-			except:
-				pass
+def overlay_lines():			#The text drawn over the video, as (text, origin, color)
+	lines = [('PC FPS: %s'%fps, (40,20), (255,255,255))]
+	try:
+		lines.append(('CPU Temperature: %s'%CPU_TEP, (370,350), (128,255,128)))
+		lines.append(('CPU Usage: %s'%CPU_USE, (370,380), (128,255,128)))
+		lines.append(('RAM Usage: %s'%RAM_USE, (370,410), (128,255,128)))
+	except NameError:			#No info received from the robot yet
+		pass
+	return tuple(lines)
+
+def render_overlay(lines):		#Rasterize each line once into a sprite with its alpha
+	sprites = []
+	for text, (x, y), color in lines:
+		(w, h), baseline = cv2.getTextSize(text, font, 0.5, 1)
+		y0 = max(y - h - 2, 0)
+		pixels = np.zeros((y + baseline + 2 - y0, w + 2, 3), np.uint8)
+		cv2.putText(pixels, text, (0, y - y0), font, 0.5, color, 1, cv2.LINE_AA)
+		alpha = pixels.max(axis=2, keepdims=True) / float(max(color))
+		sprites.append((y0, y0 + pixels.shape[0], x, x + pixels.shape[1], pixels, 1.0 - alpha))
+	return sprites
+
+def draw_overlay(source):		#Blend the cached text sprites onto the frame
+	global overlay_key, overlay_sprites
+	lines = overlay_lines()
+	if lines != overlay_key:		#Only re-render text when a value changed
+		overlay_sprites = render_overlay(lines)
+		overlay_key = lines
+	for y0, y1, x0, x1, pixels, inv_alpha in overlay_sprites:
+		roi = source[y0:y1, x0:x1]
+		if roi.shape != pixels.shape:	#Sprite runs off a smaller frame
+			continue
+		roi[:] = roi * inv_alpha + pixels
+
+def opencv_r():
+	global frame_total
+	frames = queue.Queue(maxsize=1)
+	decode_threading=thread.Thread(target=decode_r, args=(frames,))
+	decode_threading.setDaemon(True)
+	decode_threading.start()
+	while True:
+		try:
+			source = frames.get()
+			if source is None:
+				raise RuntimeError('video stream closed')
+			draw_overlay(source)
 			#cv2.putText(source,('%sm'%ultra_data),(210,290), font, 0.5,(255,255,255),1,cv2.LINE_AA)
 			cv2.imshow("Stream", source)
-			frame_num += 1
+			frame_total += 1
 			cv2.waitKey(1)
 
+		except cv2.error as e:				#A display hiccup should not end the stream
+			print('Video display failed: %s'%e)
+			continue
 		except:
-			time.sleep(0.5)
 			break
 
-fps_threading=thread.Thread(target=get_FPS)		 #Define a thread for FPV and OpenCV
-fps_threading.setDaemon(True)							 #'True' means it is a front thread,it would close when the mainloop() closes
-fps_threading.start()									 #Thread starts
 
 # video_threading=thread.Thread(target=video_thread)		 #Define a thread for FPV and OpenCV
 # video_threading.setDaemon(True)							 #'True' means it is a front thread,it would close when the mainloop() closes
@@ -109,27 +159,44 @@ fps_threading.start()									 #Thread starts
 ########>>>>>VIDEO<<<<<########
 
 
+_cfg = {}								#Contents of ./ip.txt,loaded once so the connect path does no file scanning
+_cfg_lines = []							#Every line of ./ip.txt in order,so lines without a key survive a rewrite
+
+
+def _load_cfg():
+	try:
+		with open("./ip.txt") as f:
+			for line in f:
+				line = line.rstrip('\n')
+				_cfg_lines.append(line)
+				k,sep,v = line.partition(':')
+				if sep:
+					_cfg[k+sep] = v.strip()
+	except IOError:
+		pass
+
+
 def replace_num(initial,new_num):   #Call this function to replace data in '.txt' file
-	newline=""
 	str_num=str(new_num)
-	with open("./ip.txt","r") as f:
-		for line in f.readlines():
-			if(line.find(initial) == 0):
-				line = initial+"%s" %(str_num)
-			newline += line
-	with open("./ip.txt","w") as f:
-		f.writelines(newline)	#Call this function to replace data in '.txt' file
+	if _cfg.get(initial) == str_num:
+		return
+	if initial in _cfg:
+		for i,line in enumerate(_cfg_lines):
+			if line.startswith(initial):
+				_cfg_lines[i] = initial+str_num
+	else:
+		_cfg_lines.append(initial+str_num)
+	_cfg[initial] = str_num
+	with open("./ip.txt.tmp","w") as f:
+		f.write('\n'.join(_cfg_lines)+'\n')
+	os.replace("./ip.txt.tmp","./ip.txt")	#Swap the new file in so a crash never leaves it half written
 
 
 def num_import(initial):			#Call this function to import data from '.txt' file
-	with open("./ip.txt") as f:
-		for line in f.readlines():
-			if(line.find(initial) == 0):
-				r=line
-	begin=len(list(initial))
-	snum=r[begin:]
-	n=snum
-	return n	
+	return _cfg.get(initial, '')
+
+
+_load_cfg()
 
 
 def call_forward(event):		 #When this function is called,client commands the car to move forward
@@ -259,116 +326,173 @@ def call_Switch_3(event):
 		tcpClicSock.send(('Switch_3_off').encode())
 
 
+_ui_queue = queue.Queue()				#(widget, options) from any thread,applied on the Tk thread
+
+
+def _ui_flush():						#Runs on the Tk thread every 30ms and repaints each changed widget once
+	try:
+		pending = {}
+		while True:
+			try:
+				widget, kw = _ui_queue.get_nowait()
+			except queue.Empty:
+				break
+			pending.setdefault(widget, {}).update(kw)
+		for widget, kw in pending.items():
+			widget.configure(**kw)
+	finally:
+		root.after(30, _ui_flush)		#Keep draining even if one update failed
+
+
+def ui_set(widget, **kw):				#Safe from any thread; Tk itself is only touched by _ui_flush
+	_ui_queue.put((widget, kw))
+
+
 def all_btn_red():
-	Btn_Steady.config(bg='#FF6D00', fg='#000000')
-	Btn_FindColor.config(bg='#FF6D00', fg='#000000')
-	Btn_WatchDog.config(bg='#FF6D00', fg='#000000')
-	Btn_Fun4.config(bg='#FF6D00', fg='#000000')
-	Btn_Fun5.config(bg='#FF6D00', fg='#000000')
-	Btn_Fun6.config(bg='#FF6D00', fg='#000000')
+	for btn in (Btn_Steady, Btn_FindColor, Btn_WatchDog, Btn_Fun4, Btn_Fun5, Btn_Fun6):
+		ui_set(btn, bg='#FF6D00', fg='#000000')
 
 
 def all_btn_normal():
-	Btn_Steady.config(bg=color_btn, fg=color_text)
-	Btn_FindColor.config(bg=color_btn, fg=color_text)
-	Btn_WatchDog.config(bg=color_btn, fg=color_text)
-	Btn_Fun4.config(bg=color_btn, fg=color_text)
-	Btn_Fun5.config(bg=color_btn, fg=color_text)
-	Btn_Fun6.config(bg=color_btn, fg=color_text)
-
-
-def connection_thread():
-	global funcMode, Switch_3, Switch_2, Switch_1, SmoothMode
-	while 1:
-		car_info = (tcpClicSock.recv(BUFSIZ)).decode()
-		if not car_info:
-			continue
+	for btn in (Btn_Steady, Btn_FindColor, Btn_WatchDog, Btn_Fun4, Btn_Fun5, Btn_Fun6):
+		ui_set(btn, bg=color_btn, fg=color_text)
 
-		elif 'FindColor' in car_info:
-			funcMode = 1
-			all_btn_red()
-			Btn_FindColor.config(bg='#00E676')
 
-		elif 'steady' in car_info:
-			funcMode = 1
-			all_btn_red()
-			Btn_Steady.config(bg='#00E676')
+def set_func_mode(btn):			#A server function started,highlight its button
+	global funcMode
+	funcMode = 1
+	all_btn_red()
+	ui_set(btn, bg='#00E676')
 
-		elif 'WatchDog' in car_info:
-			funcMode = 1
-			all_btn_red()
-			Btn_WatchDog.config(bg='#00E676')
 
-		elif 'Smooth_on' in car_info:
-			SmoothMode = 1
-			Btn_Smooth.config(bg='#4CAF50')
+def end_func_mode():				#The server function finished,restore all function buttons
+	global funcMode
+	funcMode = 0
+	all_btn_normal()
 
-		elif 'Smooth_off' in car_info:
-			SmoothMode = 0
-			Btn_Smooth.config(bg=color_btn)
 
-		elif 'Switch_3_on' in car_info:
-			Switch_3 = 1
-			Btn_Switch_3.config(bg='#4CAF50')
+def set_smooth(value, bg):			#Store a switch state reported by the server and recolor its button
+	global SmoothMode
+	SmoothMode = value
+	ui_set(Btn_Smooth, bg=bg)
 
-		elif 'Switch_2_on' in car_info:
-			Switch_2 = 1
-			Btn_Switch_2.config(bg='#4CAF50')
 
-		elif 'Switch_1_on' in car_info:
-			Switch_1 = 1
-			Btn_Switch_1.config(bg='#4CAF50')
+def set_switch_1(value, bg):
+	global Switch_1
+	Switch_1 = value
+	ui_set(Btn_Switch_1, bg=bg)
 
-		elif 'Switch_3_off' in car_info:
-			Switch_3 = 0
-			Btn_Switch_3.config(bg=color_btn)
 
-		elif 'Switch_2_off' in car_info:
-			Switch_2 = 0
-			Btn_Switch_2.config(bg=color_btn)
+def set_switch_2(value, bg):
+	global Switch_2
+	Switch_2 = value
+	ui_set(Btn_Switch_2, bg=bg)
 
-		elif 'Switch_1_off' in car_info:
-			Switch_1 = 0
-			Btn_Switch_1.config(bg=color_btn)
 
-		elif 'CVFL_on' in car_info:
-			function_stu = 1
-			Btn_CVFL.config(bg='#4CAF50')
+def set_switch_3(value, bg):
+	global Switch_3
+	Switch_3 = value
+	ui_set(Btn_Switch_3, bg=bg)
 
-		elif 'CVFL_off' in car_info:
-			function_stu = 0
-			Btn_CVFL.config(bg='#212121')
 
-		elif 'FunEnd' in car_info:
-			funcMode = 0
-			all_btn_normal()
+def set_cvfl(value, bg):
+	global function_stu
+	function_stu = value
+	ui_set(Btn_CVFL, bg=bg)
 
-		print(car_info)
 
+def status_handlers():				#Built once the buttons exist,looked up by the exact message
+	return {
+		'FindColor':	lambda: set_func_mode(Btn_FindColor),
+		'steady':		lambda: set_func_mode(Btn_Steady),
+		'WatchDog':		lambda: set_func_mode(Btn_WatchDog),
+		'Smooth_on':	lambda: set_smooth(1, '#4CAF50'),
+		'Smooth_off':	lambda: set_smooth(0, color_btn),
+		'Switch_3_on':	lambda: set_switch_3(1, '#4CAF50'),
+		'Switch_2_on':	lambda: set_switch_2(1, '#4CAF50'),
+		'Switch_1_on':	lambda: set_switch_1(1, '#4CAF50'),
+		'Switch_3_off':	lambda: set_switch_3(0, color_btn),
+		'Switch_2_off':	lambda: set_switch_2(0, color_btn),
+		'Switch_1_off':	lambda: set_switch_1(0, color_btn),
+		'CVFL_on':		lambda: set_cvfl(1, '#4CAF50'),
+		'CVFL_off':		lambda: set_cvfl(0, '#212121'),
+		'FunEnd':		end_func_mode,
+	}
 
-def Info_receive():
+
+def status_receive(handlers, car_info):	#A status message from the command socket
+	handler = handlers.get(car_info.strip())
+	if handler is None:				#Several messages can arrive in one recv,fall back to scanning for the first known one
+		for key in handlers:
+			if key in car_info:
+				handler = handlers[key]
+				break
+	if handler is not None:
+		handler()
+
+	print(car_info)
+
+
+def info_receive(line):				#One 'temp usage ram' sample from the info socket
 	global CPU_TEP,CPU_USE,RAM_USE
-	HOST = ''
+	try:
+		CPU_TEP,CPU_USE,RAM_USE = line.decode().split()
+		#print('cpu_tem:%s\ncpu_use:%s\nram_use:%s'%(CPU_TEP,CPU_USE,RAM_USE))
+		var_cpu_tep.set('CPU Temp: %s℃'%CPU_TEP)
+		var_cpu_use.set('CPU Usage: %s'%CPU_USE)
+		var_ram.set('RAM Usage: %s'%RAM_USE)
+	except:
+		pass
+
+
+def connection_thread():			#Serves the command socket and the info socket from one thread
+	handlers = status_handlers()
 	INFO_PORT = 2256							#Define port serial 
-	ADDR = (HOST, INFO_PORT)
-	InfoSock = socket(AF_INET, SOCK_STREAM)
-	InfoSock.setsockopt(SOL_SOCKET,SO_REUSEADDR,1)
-	InfoSock.bind(ADDR)
-	InfoSock.listen(5)					  #Start server,waiting for client
-	InfoSock, addr = InfoSock.accept()
-	print('Info connected')
-	while 1:
-		try:
-			info_data = ''
-			info_data = str(InfoSock.recv(BUFSIZ).decode())
-			info_get = info_data.split()
-			CPU_TEP,CPU_USE,RAM_USE= info_get
-			#print('cpu_tem:%s\ncpu_use:%s\nram_use:%s'%(CPU_TEP,CPU_USE,RAM_USE))
-			CPU_TEP_lab.config(text='CPU Temp: %s℃'%CPU_TEP)
-			CPU_USE_lab.config(text='CPU Usage: %s'%CPU_USE)
-			RAM_lab.config(text='RAM Usage: %s'%RAM_USE)
-		except:
-			pass
+	InfoServer = socket(AF_INET, SOCK_STREAM)
+	InfoServer.setsockopt(SOL_SOCKET,SO_REUSEADDR,1)
+	InfoServer.bind(('', INFO_PORT))
+	InfoServer.listen(5)					  #Start server,waiting for client
+
+	sel = selectors.DefaultSelector()
+	sel.register(tcpClicSock, selectors.EVENT_READ, 'status')
+	sel.register(InfoServer, selectors.EVENT_READ, 'accept')
+	info_buf = b''
+	info_lines = False					#Set once the robot ends samples with newlines; older servers do not
+	while sel.get_map():
+		for key, _ in sel.select():
+			sock = key.fileobj
+			if key.data == 'accept':		#The robot connects once,stop listening after that
+				InfoSock, addr = sock.accept()
+				print('Info connected')
+				sel.unregister(sock)
+				sock.close()
+				sel.register(InfoSock, selectors.EVENT_READ, 'info')
+				continue
+
+			try:
+				data = sock.recv(BUFSIZ)
+			except OSError as e:			#Connection reset,drop only this socket
+				print('%s socket error: %s'%(key.data, e))
+				data = b''
+			if not data:					#Peer closed the socket or it failed
+				sel.unregister(sock)
+				sock.close()
+				continue
+			try:							#A bad message must not stop the other channel
+				if key.data == 'status':
+					status_receive(handlers, data.decode())
+				elif b'\n' in data or info_lines:
+					info_lines = True
+					info_buf += data
+					*lines, info_buf = info_buf.split(b'\n')	#One sample per line,a partial line waits for the next recv
+					if len(info_buf) > 4096:	#No newline in sight,drop the garbage instead of growing forever
+						info_buf = b''
+					for line in lines:
+						info_receive(line)
+				else:						#Older server: one unterminated sample per send
+					info_receive(data)
+			except Exception as e:
+				print('Bad %s message: %s'%(key.data, e))
 
 
 def socket_connect():	 #Call this function to connect with the server
@@ -377,9 +501,8 @@ def socket_connect():	 #Call this function to connect with the server
 
 	if ip_adr == '':	  #If no input IP address in Entry,import a default IP
 		ip_adr=num_import('IP:')
-		l_ip_4.config(text='Connecting')
-		l_ip_4.config(bg='#FF8F00')
-		l_ip_5.config(text='Default:%s'%ip_adr)
+		ui_set(l_ip_4, text='Connecting', bg='#FF8F00')
+		ui_set(l_ip_5, text='Default:%s'%ip_adr)
 		pass
 	
 	SERVER_IP = ip_adr
@@ -387,6 +510,7 @@ def socket_connect():	 #Call this function to connect with the server
 	BUFSIZ = 1024		 #Define buffer size
 	ADDR = (SERVER_IP, SERVER_PORT)
 	tcpClicSock = socket(AF_INET, SOCK_STREAM) #Set connection value for socket
+	tcpClicSock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1) #Send short commands at once instead of waiting on Nagle
 
 	for i in range (1,6): #Try 5 times if disconnected
 		#try:
@@ -397,9 +521,8 @@ def socket_connect():	 #Call this function to connect with the server
 		
 			print("Connected")
 		
-			l_ip_5.config(text='IP:%s'%ip_adr)
-			l_ip_4.config(text='Connected')
-			l_ip_4.config(bg='#558B2F')
+			ui_set(l_ip_5, text='IP:%s'%ip_adr)
+			ui_set(l_ip_4, text='Connected', bg='#558B2F')
 
 			replace_num('IP:',ip_adr)
 			E1.config(state='disabled')	  #Disable the Entry
@@ -416,10 +539,6 @@ def socket_connect():	 #Call this function to connect with the server
 			video_threading.start()									 #Thread starts
 
 
-			info_threading=thread.Thread(target=Info_receive)		 #Define a thread for FPV and OpenCV
-			info_threading.setDaemon(True)							 #'True' means it is a front thread,it would close when the mainloop() closes
-			info_threading.start()									 #Thread starts
-
 			video_threading=thread.Thread(target=opencv_r)		 #Define a thread for FPV and OpenCV
 			video_threading.setDaemon(True)							 #'True' means it is a front thread,it would close when the mainloop() closes
 			video_threading.start()									 #Thread starts
@@ -427,16 +546,14 @@ def socket_connect():	 #Call this function to connect with the server
 			break
 		else:
 			print("Cannot connecting to server,try it latter!")
-			l_ip_4.config(text='Try %d/5 time(s)'%i)
-			l_ip_4.config(bg='#EF6C00')
+			ui_set(l_ip_4, text='Try %d/5 time(s)'%i, bg='#EF6C00')
 			print('Try %d/5 time(s)'%i)
 			ip_stu=1
 			time.sleep(1)
 			continue
 
 	if ip_stu == 1:
-		l_ip_4.config(text='Disconnected')
-		l_ip_4.config(bg='#F44336')
+		ui_set(l_ip_4, text='Disconnected', bg='#F44336')
 
 
 def connect(event):	   #Call this function to connect with the server
@@ -453,44 +570,57 @@ def connect_click():	   #Call this function to connect with the server
 		sc.start()							  #Thread starts
 
 
+_pending = {}							#Latest value of each Scale command waiting to be sent
+_flush_id = None
+
+
+def _flush():
+	global _flush_id
+	_flush_id = None
+	for cmd, value in _pending.items():
+		tcpClicSock.send(('%s %s'%(cmd, value)).encode())
+	_pending.clear()
+
+
+def send_scale(cmd, value):				#Scales fire on every step while dragging,send only the newest value every 30ms
+	global _flush_id
+	_pending[cmd] = value
+	if _flush_id is None:
+		_flush_id = root.after(30, _flush)
+
+
 def set_R(event):
-	time.sleep(0.03)
-	tcpClicSock.send(('wsR %s'%var_R.get()).encode())
+	send_scale('wsR', var_R.get())
 
 
 def set_G(event):
-	time.sleep(0.03)
-	tcpClicSock.send(('wsG %s'%var_G.get()).encode())
+	send_scale('wsG', var_G.get())
 
 
 def set_B(event):
-	time.sleep(0.03)
-	tcpClicSock.send(('wsB %s'%var_B.get()).encode())
+	send_scale('wsB', var_B.get())
 
 
 def EC_send(event):#z
-		tcpClicSock.send(('setEC %s'%var_ec.get()).encode())
-		time.sleep(0.03)
+	send_scale('setEC', var_ec.get())
 
 
 def EC_default(event):#z
 	var_ec.set(0)
+	_pending.pop('setEC', None)			#Drop a queued setEC so it cannot override the reset
 	tcpClicSock.send(('defEC').encode())
 
 
 def scale_FL(x,y,w):#1
 	global Btn_CVFL
 	def lip1_send(event):
-		time.sleep(0.03)
-		tcpClicSock.send(('lip1 %s'%var_lip1.get()).encode())
+		send_scale('lip1', var_lip1.get())
 
 	def lip2_send(event):
-		time.sleep(0.03)
-		tcpClicSock.send(('lip2 %s'%var_lip2.get()).encode())
+		send_scale('lip2', var_lip2.get())
 
 	def err_send(event):
-		time.sleep(0.03)
-		tcpClicSock.send(('err %s'%var_err.get()).encode())
+		send_scale('err', var_err.get())
 
 	def call_Render(event):
 		tcpClicSock.send(('Render').encode())
@@ -533,7 +663,7 @@ def scale_FL(x,y,w):#1
 
 
 def loop():					  #GUI
-	global tcpClicSock,root,E1,connect,l_ip_4,l_ip_5,color_btn,color_text,Btn14,CPU_TEP_lab,CPU_USE_lab,RAM_lab,canvas_ultra,color_text,var_lip1,var_lip2,var_err,var_R,var_B,var_G,var_ec,Btn_Steady,Btn_FindColor,Btn_WatchDog,Btn_Fun4,Btn_Fun5,Btn_Fun6,Btn_Switch_1,Btn_Switch_2,Btn_Switch_3,Btn_Smooth,color_bg   #1 The value of tcpClicSock changes in the function loop(),would also changes in global so the other functions could use it.
+	global tcpClicSock,root,E1,connect,l_ip_4,l_ip_5,color_btn,color_text,Btn14,CPU_TEP_lab,CPU_USE_lab,RAM_lab,var_cpu_tep,var_cpu_use,var_ram,canvas_ultra,color_text,var_lip1,var_lip2,var_err,var_R,var_B,var_G,var_ec,Btn_Steady,Btn_FindColor,Btn_WatchDog,Btn_Fun4,Btn_Fun5,Btn_Fun6,Btn_Switch_1,Btn_Switch_2,Btn_Switch_3,Btn_Smooth,color_bg   #1 The value of tcpClicSock changes in the function loop(),would also changes in global so the other functions could use it.
 	while True:
 		color_bg='#000000'		#Set background color
 		color_text='#E1F5FE'	  #Set text color
@@ -555,13 +685,19 @@ def loop():					  #GUI
 		except:
 			pass
 
-		CPU_TEP_lab=tk.Label(root,width=18,text='CPU Temp:',fg=color_text,bg='#212121')
+		var_cpu_tep=tk.StringVar()
+		var_cpu_tep.set('CPU Temp:')
+		CPU_TEP_lab=tk.Label(root,width=18,textvariable=var_cpu_tep,fg=color_text,bg='#212121')
 		CPU_TEP_lab.place(x=400,y=15)						 #Define a Label and put it in position
 
-		CPU_USE_lab=tk.Label(root,width=18,text='CPU Usage:',fg=color_text,bg='#212121')
+		var_cpu_use=tk.StringVar()
+		var_cpu_use.set('CPU Usage:')
+		CPU_USE_lab=tk.Label(root,width=18,textvariable=var_cpu_use,fg=color_text,bg='#212121')
 		CPU_USE_lab.place(x=400,y=45)						 #Define a Label and put it in position
 
-		RAM_lab=tk.Label(root,width=18,text='RAM Usage:',fg=color_text,bg='#212121')
+		var_ram=tk.StringVar()
+		var_ram.set('RAM Usage:')
+		RAM_lab=tk.Label(root,width=18,textvariable=var_ram,fg=color_text,bg='#212121')
 		RAM_lab.place(x=400,y=75)						 #Define a Label and put it in position
 
 		l_ip=tk.Label(root,width=18,text='Status',fg=color_text,bg=color_btn)
@@ -755,6 +891,9 @@ def loop():					  #GUI
 
 		scale_FL(30,490,315)#1
 
+		root.after(1000, get_FPS)		#Update the FPS shown on the video once a second
+		root.after(30, _ui_flush)		#Apply widget changes queued by the network threads
+
 		global stat
 		if stat==0:			  # Ensure the mainloop runs only once
 			root.mainloop()  # Run the mainloop()
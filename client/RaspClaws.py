@@ -9,7 +9,6 @@
 # 
 import cv2
 import zmq
-import base64
 import numpy as np
 from socket import *
 import sys
@@ -41,7 +40,7 @@ def video_thread():
 	context = zmq.Context()
 	footage_socket = context.socket(zmq.SUB)
 	footage_socket.bind('tcp://*:5555')
-	footage_socket.setsockopt_string(zmq.SUBSCRIBE, np.unicode(''))
+	footage_socket.setsockopt(zmq.SUBSCRIBE, b'')
 
 	font = cv2.FONT_HERSHEY_SIMPLEX
 
@@ -62,9 +61,8 @@ def opencv_r():
 	global frame_num
 	while True:
 		try:
-			frame = footage_socket.recv_string()
-			img = base64.b64decode(frame)
-			npimg = np.frombuffer(img, dtype=np.uint8)
+			frame = footage_socket.recv(copy=False)
+			npimg = np.frombuffer(frame.buffer, dtype=np.uint8)
 			source = cv2.imdecode(npimg, 1)
 			cv2.putText(source,('PC FPS: %s'%fps),(40,20), font, 0.5,(255,255,255),1,cv2.LINE_AA)
 			try:
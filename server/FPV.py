@@ -10,7 +10,6 @@ import time
 import threading
 import cv2
 import zmq
-import base64
 import picamera
 from picamera.array import PiRGBArray
 import argparse
@@ -368,8 +367,7 @@ class FPV:
                 encoded, buffer = cv2.imencode('.jpg', frame_findline)
             else:
                 encoded, buffer = cv2.imencode('.jpg', frame_image)
-            jpg_as_text = base64.b64encode(buffer)
-            footage_socket.send(jpg_as_text)
+            footage_socket.send(buffer, copy=False)   # raw JPEG bytes, ZMQ frames are binary safe
 
             rawCapture.truncate(0)
 
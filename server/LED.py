@@ -41,14 +41,18 @@ class LED:
         self.strip = Adafruit_NeoPixel(self.LED_COUNT, self.LED_PIN, self.LED_FREQ_HZ, self.LED_DMA, self.LED_INVERT, self.LED_BRIGHTNESS, self.LED_CHANNEL)
         # Intialize the library (must be called once before other functions).
         self.strip.begin()
+        self.last_color = None  # Colour currently shown by colorWipe
 
     # Define functions which animate LEDs in various ways.
     def colorWipe(self, color, wait_ms=0):
         """Wipe color across display a pixel at a time."""
+        if color == self.last_color:
+            return  # Strip already shows this colour, skip the upload
+        self.last_color = color
         for i in range(self.strip.numPixels()):
             self.strip.setPixelColor(i, color)
-            self.strip.show()
             #time.sleep(wait_ms/1000.0)
+        self.strip.show()  # one strip upload for all pixels
 
 
     def breath_status_set(self, status):
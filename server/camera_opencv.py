@@ -339,6 +339,7 @@ class CVThread(threading.Thread):
 
 class Camera(BaseCamera):
 	video_source = 0
+	raw_frame = None  # latest frame as an array, before JPEG encoding
 	modeSelect = 'none'
 	# modeSelect = 'findlineCV'
 	# modeSelect = 'findColor'
@@ -351,6 +352,11 @@ class Camera(BaseCamera):
 		super(Camera, self).__init__()
 
 
+	def get_raw_frame(self):
+		"""Wait for the next frame and return it as an array."""
+		self.get_frame()
+		return Camera.raw_frame
+
 	def colorFindSet(self, invarH, invarS, invarV):
 		global colorUpper, colorLower
 		HUE_1 = invarH+15
@@ -423,6 +429,7 @@ class Camera(BaseCamera):
 
 			# Convert BGR to RGB
 			img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+			Camera.raw_frame = img
 
 			if Camera.modeSelect == 'none':
 				switch.switch(1,0)
@@ -434,10 +441,12 @@ class Camera(BaseCamera):
 					cvt.mode(Camera.modeSelect, img)
 					cvt.resume()
 				try:
-					img = cvt.elementDraw(img)
+					# Draw on a copy: raw_frame and the CV thread keep reading img
+					img = cvt.elementDraw(img.copy())
 				except:
 					pass
 
-			# encode as a jpeg image and return it
-			if cv2.imencode('.jpg', img)[0]:
-				yield cv2.imencode('.jpg', img)[1].tobytes()
\ No newline at end of file
+			# encode as a jpeg image and return it (once per frame)
+			ok, jpeg = cv2.imencode('.jpg', img)
+			if ok:
+				yield jpeg.tobytes()
\ No newline at end of file
@@ -55,6 +55,7 @@ class RobotLight(threading.Thread):
 		self.strip = Adafruit_NeoPixel(self.LED_COUNT, self.LED_PIN, self.LED_FREQ_HZ, self.LED_DMA, self.LED_INVERT, self.LED_BRIGHTNESS, self.LED_CHANNEL)
 		# Intialize the library (must be called once before other functions).
 		self.strip.begin()
+		self.pixelColors = [None] * self.LED_COUNT	# Colour last uploaded for each pixel
 
 		super(RobotLight, self).__init__(*args, **kwargs)
 		self.__flag = threading.Event()
@@ -131,17 +132,23 @@ class RobotLight(threading.Thread):
 	def setColor(self, R, G, B):
 		"""Wipe color across display a pixel at a time."""
 		color = Color(int(R),int(G),int(B))
+		if self.pixelColors.count(color) == len(self.pixelColors):
+			return	# Strip already shows this colour, skip the upload
 		for i in range(self.strip.numPixels()):
 			self.strip.setPixelColor(i, color)
-			self.strip.show()
+			self.pixelColors[i] = color
+		self.strip.show()  # one strip upload for all pixels
 
 
 	def setSomeColor(self, R, G, B, ID):
 		color = Color(int(R),int(G),int(B))
 		#print(int(R),'  ',int(G),'  ',int(B))
+		if all(self.pixelColors[i] == color for i in ID):
+			return	# These pixels already show this colour, skip the upload
 		for i in ID:
 			self.strip.setPixelColor(i, color)
-			self.strip.show()
+			self.pixelColors[i] = color
+		self.strip.show()
 
 
 	def pause(self):